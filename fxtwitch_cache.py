@@ -1,11 +1,19 @@
 # fxtwitch.py by RoyRiv3r
 
 import os
+import time
+import re
+import hashlib
+import html
+import asyncio
 import logging
+from functools import lru_cache
+from cachetools import TTLCache
 from fastapi import FastAPI, Request
-from fastapi.responses import RedirectResponse, HTMLResponse, PlainTextResponse
-import requests
-from urllib.parse import urlencode
+from fastapi.responses import RedirectResponse, HTMLResponse, PlainTextResponse, Response
+import httpx
+import orjson
+from urllib.parse import urlencode, quote
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -17,16 +25,16 @@ app = FastAPI()
 # Configure Logging
 LOGGING_ENABLED = os.getenv('LOGGING_ENABLED', 'false').lower() == 'true'
 
+LOG_LEVEL = logging.INFO if LOGGING_ENABLED else logging.WARNING
+
+logging.basicConfig(
+    level=LOG_LEVEL,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
 logger = logging.getLogger("app_logger")
-if LOGGING_ENABLED:
-  logging.basicConfig(
-      level=logging.INFO,
-      format="%(asctime)s - %(levelname)s - %(message)s",
-  )
-  logger.setLevel(logging.INFO)
-  logger.info("🔍 Logging is enabled.")
-else:
-  logging.basicConfig(level=logging.WARNING)  # Suppress logs if disabled
+# Set explicitly so info calls are rejected by the level check when disabled
+logger.setLevel(LOG_LEVEL)
+logger.info("🔍 Logging is enabled.")
 
 # Twitch credentials from environment variables
 TWITCH_CLIENT_ID = os.getenv('TWITCH_CLIENT_ID')
@@ -35,8 +43,121 @@ TWITCH_CLIENT_SECRET = os.getenv('TWITCH_CLIENT_SECRET')
 # Constants
 GITHUB_REDIRECT_URL = 'https://github.com/RoyRiv3r/RoyRiv3r'
 TINYURL_API = 'https://tinyurl.com/api-create.php'
+GQL_URL = 'https://gql.twitch.tv/gql'
+
+# Clip IDs accepted by /clip/{clip_id}
+_SLUG_RE = re.compile(r"\A[A-Za-z0-9_\-]{1,100}\Z")
+
+# GQL request body, serialized once; "__SLUG__" is replaced per request
+_GQL_PAYLOAD_TEMPLATE = orjson.dumps([
+    {
+        "operationName": "VideoPlayerStreamInfoOverlayClip",
+        "variables": {"slug": "__SLUG__"},
+        "extensions": {
+            "persistedQuery": {
+                "version": 1,
+                "sha256Hash": "fcefd8b2081e39d16cbdc94bc82142df01b143bb296f0043262c44c37dbd1f63"
+            }
+        }
+    },
+    {
+        "operationName": "VideoAccessToken_Clip",
+        "variables": {"platform": "web", "slug": "__SLUG__"},
+        "extensions": {
+            "persistedQuery": {
+                "version": 1,
+                "sha256Hash": "6fd3af2b22989506269b9ac02dd87eb4a6688392d67d94e41a6886f1e9f5c00f"
+            }
+        }
+    }
+])
+
+# Refresh the cached access token this many seconds before it expires
+TOKEN_EXPIRY_MARGIN = 60
+# Start a background refresh once the token has less than this many seconds left
+TOKEN_REFRESH_AHEAD = 300
+# Wait this many seconds after a failed background refresh before trying again
+TOKEN_REFRESH_BACKOFF = 30
+
+# Outbound HTTP timeouts (seconds); the token endpoint gets a tighter read
+UPSTREAM_TIMEOUT = httpx.Timeout(connect=2.0, read=5.0, write=5.0, pool=2.0)
+TOKEN_TIMEOUT = httpx.Timeout(connect=2.0, read=3.0, write=3.0, pool=2.0)
+# Largest GQL response body we are willing to buffer
+GQL_MAX_RESPONSE_BYTES = 1 * 1024 * 1024
+
+# Clip info cache settings
+CLIP_CACHE_MAXSIZE = 10_000
+CLIP_CACHE_TTL = 1800  # seconds
+MISSING_CLIP_CACHE_TTL = 60  # seconds
+
+# Embed HTML for clip pages; fields are HTML-escaped before formatting
+_CLIP_HTML = """
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="theme-color" content="#6441a5">
+    <meta property="og:title" content="{broadcaster_name} - {title}">
+    <meta property="og:type" content="video">
+    <meta property="og:site_name" content="👁️ Views: {view_count} | {creator_name}">
+    <meta property="og:url" content="{url}">
+    <meta property="og:video" content="{video_url}">
+    <meta property="og:video:secure_url" content="{video_url}">
+    <meta property="og:video:type" content="video/mp4">
+    <meta property="og:image" content="{thumbnail_url}">
+    <script>
+        window.onload = function() {{
+            window.location.href = "{url}";
+        }};
+    </script>
+</head>
+<body>
+    <p>Redirecting you to the Twitch clip...</p>
+    <p>If you are not redirected automatically, <a href="{url}">click here</a>.</p>
+</body>
+</html>
+"""
+
+# HTTP caching headers for downstream caches (CDNs, unfurlers, browsers)
+CLIP_CACHE_CONTROL = 'public, max-age=900, s-maxage=3600'
+ROOT_CACHE_CONTROL = 'public, max-age=86400, immutable'
+
+class ClipNotFoundError(Exception):
+  """
+  Raised when Twitch has no clip for the requested clip ID.
+  """
+
+# Shared HTTP client, created on startup so connections stay pooled
+http_client: httpx.AsyncClient = None
+
+@app.on_event("startup")
+async def startup_http_client():
+  """
+  Creates the shared HTTP/2 client used for all upstream requests.
+  """
+  global http_client
+  http_client = httpx.AsyncClient(
+      http2=True,
+      timeout=UPSTREAM_TIMEOUT,
+      limits=httpx.Limits(max_keepalive_connections=100),
+  )
 
-def fetch_twitch_access_token() -> dict:
+@app.on_event("shutdown")
+async def shutdown_http_client():
+  """
+  Cancels pending upstream work, then closes the shared HTTP client.
+  """
+  pending = [task for task in (_token_refresh_task, *_clip_fetches.values()) if task is not None]
+  for task in pending:
+      task.cancel()
+  await asyncio.gather(*pending, return_exceptions=True)
+  await http_client.aclose()
+
+# Cached Twitch app access token, shared across requests
+_token_cache = {'value': None, 'expires_at': 0.0, 'lifetime': 0, 'refresh_failed_at': None}
+_token_lock = asyncio.Lock()
+_token_refresh_task: asyncio.Task = None
+
+async def fetch_twitch_access_token() -> dict:
   """
   Fetches Twitch OAuth access token.
   """
@@ -48,188 +169,356 @@ def fetch_twitch_access_token() -> dict:
       'grant_type': 'client_credentials'
   }
 
-  response = requests.post(url, params=params)
+  response = await http_client.post(url, params=params, timeout=TOKEN_TIMEOUT)
 
   if response.status_code != 200:
-      logger.error(f"❌ Failed to get access token: {response.text}")
+      logger.error("❌ Failed to get access token: %s", response.text)
       raise Exception(f"Failed to get access token: {response.text}")
 
-  data = response.json()
+  data = orjson.loads(response.content)
   logger.info("✅ Twitch access token obtained successfully.")
   return data
 
-def fetch_clip_info_sync(clip_id: str) -> dict:
+async def _store_twitch_access_token() -> str:
   """
-  Fetches clip information from Twitch using their GraphQL API.
+  Fetches a new access token and stores it in the cache.
   """
-  logger.info(f"🔍 Fetching clip info for clip_id: {clip_id}")
-  access_token_data = fetch_twitch_access_token()
-  access_token = access_token_data['access_token']
-  url = 'https://gql.twitch.tv/gql'
-  headers = {
-      'Client-ID': 'kimne78kx3ncx6brgo4mv6wki5h1ko',  # Static Client-ID used by Twitch web
-      'Authorization': f'Bearer {access_token}',
-      'Content-Type': 'application/json',
-  }
+  data = await fetch_twitch_access_token()
+  _token_cache['value'] = data['access_token']
+  _token_cache['expires_at'] = time.monotonic() + data['expires_in']
+  _token_cache['lifetime'] = data['expires_in']
+  return _token_cache['value']
 
-  payload = [
-      {
-          "operationName": "VideoPlayerStreamInfoOverlayClip",
-          "variables": {"slug": clip_id},
-          "extensions": {
-              "persistedQuery": {
-                  "version": 1,
-                  "sha256Hash": "fcefd8b2081e39d16cbdc94bc82142df01b143bb296f0043262c44c37dbd1f63"
-              }
-          }
-      },
-      {
-          "operationName": "VideoAccessToken_Clip",
-          "variables": {"platform": "web", "slug": clip_id},
-          "extensions": {
-              "persistedQuery": {
-                  "version": 1,
-                  "sha256Hash": "6fd3af2b22989506269b9ac02dd87eb4a6688392d67d94e41a6886f1e9f5c00f"
-              }
-          }
-      }
-  ]
+async def _refresh_twitch_access_token_bg(scheduled_expires_at: float):
+  """
+  Refreshes the access token ahead of expiry without blocking callers.
+  """
+  global _token_refresh_task
+  try:
+      async with _token_lock:
+          # Skip if the token was replaced since this refresh was scheduled
+          if _token_cache['expires_at'] != scheduled_expires_at:
+              return
+          await _store_twitch_access_token()
+  except Exception as e:
+      _token_cache['refresh_failed_at'] = time.monotonic()
+      logger.error("❌ Background token refresh failed: %s", e)
+  finally:
+      _token_refresh_task = None
+
+async def get_twitch_access_token() -> str:
+  """
+  Returns the cached Twitch access token, refreshing it when close to expiry.
+  """
+  global _token_refresh_task
+  now = time.monotonic()
+  remaining = _token_cache['expires_at'] - now
+  if remaining > TOKEN_EXPIRY_MARGIN:
+      # Still usable; refresh in the background so no request waits on it.
+      # Tokens that never outlive the refresh window are left to expire,
+      # otherwise every request would refresh them again. After a failed
+      # refresh, back off instead of retrying on every request.
+      failed_at = _token_cache['refresh_failed_at']
+      if (remaining < TOKEN_REFRESH_AHEAD
+              and _token_cache['lifetime'] > TOKEN_REFRESH_AHEAD
+              and _token_refresh_task is None
+              and (failed_at is None or now - failed_at >= TOKEN_REFRESH_BACKOFF)):
+          _token_refresh_task = asyncio.create_task(
+              _refresh_twitch_access_token_bg(_token_cache['expires_at'])
+          )
+      return _token_cache['value']
+
+  async with _token_lock:
+      # Another request may have refreshed the token while we waited
+      if time.monotonic() < _token_cache['expires_at'] - TOKEN_EXPIRY_MARGIN:
+          return _token_cache['value']
+      return await _store_twitch_access_token()
+
+def invalidate_twitch_access_token():
+  """
+  Forces the next get_twitch_access_token call to fetch a new token.
+  """
+  _token_cache['expires_at'] = 0.0
 
-  response = requests.post(url, headers=headers, json=payload)
+async def read_capped_body(response: httpx.Response, limit: int) -> bytes:
+  """
+  Reads a streamed response body, failing if it grows beyond limit bytes.
+  """
+  body = bytearray()
+  async for chunk in response.aiter_bytes():
+      body += chunk
+      if len(body) > limit:
+          raise Exception(f"Upstream response exceeded {limit} bytes")
+  return bytes(body)
+
+async def fetch_clip_info(clip_id: str) -> dict:
+  """
+  Fetches clip information from Twitch using their GraphQL API.
+  """
+  logger.info("🔍 Fetching clip info for clip_id: %s", clip_id)
+  body = _GQL_PAYLOAD_TEMPLATE.replace(b'"__SLUG__"', orjson.dumps(clip_id))
+
+  # Retry once with a fresh token if Twitch rejects the cached one
+  for attempt in range(2):
+      access_token = await get_twitch_access_token()
+      headers = {
+          'Client-ID': 'kimne78kx3ncx6brgo4mv6wki5h1ko',  # Static Client-ID used by Twitch web
+          'Authorization': f'Bearer {access_token}',
+          'Content-Type': 'application/json',
+      }
+      async with http_client.stream('POST', GQL_URL, headers=headers, content=body) as response:
+          if response.status_code == 401 and attempt == 0:
+              logger.warning("🔑 Access token rejected; refreshing and retrying.")
+              invalidate_twitch_access_token()
+              continue
+          response_body = await read_capped_body(response, GQL_MAX_RESPONSE_BYTES)
+      break
 
   if response.status_code != 200:
-      logger.error(f"❌ Failed to get clip info: {response.text}")
-      raise Exception(f"Failed to get clip info: {response.text}")
+      text = response_body.decode(errors='replace')
+      logger.error("❌ Failed to get clip info: %s", text)
+      raise Exception(f"Failed to get clip info: {text}")
 
-  response_data = response.json()
+  response_data = orjson.loads(response_body)
 
   # Parse clip information
   try:
       clip_data = response_data[0]['data']['clip']
-      access_data = response_data[1]['data']['clip']['playbackAccessToken']
-      video_qualities = response_data[1]['data']['clip']['videoQualities']
+      if clip_data is None:
+          logger.warning("🚫 Clip not found for clip_id: %s", clip_id)
+          raise ClipNotFoundError(f"Clip not found: {clip_id}")
+      access_clip = response_data[1]['data']['clip']
+      access_data = access_clip['playbackAccessToken']
+      # Select the first available video quality
+      video_url = access_clip['videoQualities'][0]['sourceURL']
   except (IndexError, KeyError, TypeError) as e:
-      logger.error(f"❌ Unexpected response structure: {str(e)}")
+      logger.error("❌ Unexpected response structure: %s", e)
       raise Exception(f"Unexpected response structure: {str(e)}")
 
-  signature = access_data['signature']
-  token = access_data['value']
-
-  # Select the first available video quality
-  video_url = video_qualities[0]['sourceURL']
-  final_video_url = f"{video_url}?sig={signature}&token={requests.utils.quote(token)}"
+  slug = clip_data['slug']
+  broadcaster = clip_data['broadcaster']
+  token_q = quote(access_data['value'], safe='')
+  final_video_url = f"{video_url}?sig={access_data['signature']}&token={token_q}"
 
   clip_info = {
-      'broadcaster_name': clip_data['broadcaster']['displayName'],
+      'broadcaster_name': broadcaster['displayName'],
       'title': clip_data['title'],
-      'url': f"https://clips.twitch.tv/{clip_data['slug']}",
+      'url': f"https://clips.twitch.tv/{slug}",
       'view_count': clip_data['viewCount'],
-      'creator_name': clip_data['broadcaster']['login'],
-      'thumbnail_url': f"https://clips-media-assets2.twitch.tv/{clip_data['slug']}-preview-480x272.jpg",
+      'creator_name': broadcaster['login'],
+      'thumbnail_url': f"https://clips-media-assets2.twitch.tv/{slug}-preview-480x272.jpg",
       'video_url': final_video_url
   }
 
-  logger.info(f"✅ Clip info retrieved for clip_id: {clip_id}")
+  logger.info("✅ Clip info retrieved for clip_id: %s", clip_id)
+  return clip_info
+
+# Cached clip info, plus the in-flight fetch per clip so concurrent misses share one
+_clip_cache = TTLCache(maxsize=CLIP_CACHE_MAXSIZE, ttl=CLIP_CACHE_TTL)
+# Clip IDs Twitch reported as missing, remembered briefly to avoid refetching
+_missing_clip_cache = TTLCache(maxsize=CLIP_CACHE_MAXSIZE, ttl=MISSING_CLIP_CACHE_TTL)
+_clip_fetches: dict = {}
+
+async def _load_clip_info(clip_id: str) -> dict:
+  """
+  Fetches clip information and its shortened video URL, then caches both.
+  """
+  try:
+      clip_info = await fetch_clip_info(clip_id)
+  except ClipNotFoundError:
+      _missing_clip_cache[clip_id] = True
+      raise
+  clip_info['shortened_url'] = await fetch_shortened_url(clip_info['video_url'])
+  _clip_cache[clip_id] = clip_info
   return clip_info
 
-def fetch_shortened_url_sync(url: str) -> str:
+def _forget_clip_fetch(clip_id: str, task: asyncio.Task):
+  """
+  Drops a finished clip fetch and marks its exception as retrieved.
+  """
+  if _clip_fetches.get(clip_id) is task:
+      del _clip_fetches[clip_id]
+  if not task.cancelled():
+      task.exception()
+
+async def get_clip_info(clip_id: str) -> dict:
+  """
+  Returns clip information, served from the cache when available.
+  """
+  clip_info = _clip_cache.get(clip_id)
+  if clip_info is not None:
+      logger.info("⚡ Clip info cache hit for clip_id: %s", clip_id)
+      return clip_info
+  if clip_id in _missing_clip_cache:
+      raise ClipNotFoundError(f"Clip not found: {clip_id}")
+
+  # Join the fetch already running for this clip, or start one; every
+  # waiter gets the same result or exception
+  task = _clip_fetches.get(clip_id)
+  if task is None:
+      task = asyncio.create_task(_load_clip_info(clip_id))
+      _clip_fetches[clip_id] = task
+      task.add_done_callback(lambda t: _forget_clip_fetch(clip_id, t))
+  # Shielded so one disconnecting client does not cancel the fetch for the rest
+  return await asyncio.shield(task)
+
+async def fetch_shortened_url(url: str) -> str:
   """
   Shortens a given URL using the TinyURL API.
   """
 
-  logger.info(f"🔗 Shortening URL: {url}")
+  logger.info("🔗 Shortening URL: %s", url)
   params = {'url': url}
-  response = requests.get(TINYURL_API, params=params)
+  response = await http_client.get(TINYURL_API, params=params)
 
   if response.status_code != 200:
       logger.error('❌ Failed to shorten URL')
       raise Exception('Failed to shorten URL')
 
   shortened = response.text.strip()
-  logger.info(f"✅ URL shortened to: {shortened}")
+  logger.info("✅ URL shortened to: %s", shortened)
   return shortened
 
-async def get_twitch_access_token() -> str:
+@app.get("/", response_class=RedirectResponse)
+def root():
   """
-  Asynchronous wrapper to get Twitch access token.
+  Redirect the root URL to the specified GitHub repository.
   """
-  token_data = fetch_twitch_access_token()
-  return token_data['access_token']
+  logger.info("🏠 Root endpoint accessed; redirecting to GitHub repository.")
+  return RedirectResponse(
+      url=GITHUB_REDIRECT_URL,
+      status_code=301,
+      headers={'Cache-Control': ROOT_CACHE_CONTROL},
+  )
 
-async def get_clip_info(clip_id: str) -> dict:
+# clip_info fields covered by the ETag. The short URL is left out because each
+# worker and cache fill gets its own TinyURL, so the ETag is sent as weak: pages
+# with the same validator show the same clip but may link different short URLs.
+_ETAG_FIELDS = ('broadcaster_name', 'title', 'view_count', 'creator_name')
+
+def clip_etag(clip_id: str, clip_info: dict) -> str:
   """
-  Asynchronous wrapper to get clip information.
+  Builds a weak ETag for a clip response from its stable fields.
   """
-  clip_info = fetch_clip_info_sync(clip_id)
-  return clip_info
+  stable = "\0".join(str(clip_info[field]) for field in _ETAG_FIELDS)
+  digest = hashlib.blake2b(f"{clip_id}\0{stable}".encode(), digest_size=8).hexdigest()
+  return f'W/"{digest}"'
 
-async def shorten_url(url: str) -> str:
+def etag_matches(if_none_match: str, etag: str) -> bool:
+  """
+  Checks an If-None-Match header against an ETag using weak comparison.
+  """
+  opaque = etag[2:] if etag.startswith('W/') else etag
+  for candidate in if_none_match.split(','):
+      candidate = candidate.strip()
+      if candidate == '*':
+          return True
+      if candidate.startswith('W/'):
+          candidate = candidate[2:]
+      if candidate == opaque:
+          return True
+  return False
+
+@lru_cache(maxsize=2048)
+def render_clip_html(broadcaster_name: str, title: str, url: str, view_count: int,
+                    creator_name: str, thumbnail_url: str, video_url: str) -> bytes:
   """
-  Asynchronous wrapper to shorten URLs.
+  Renders the escaped clip embed HTML, memoized per distinct clip rendering.
   """
-  return fetch_shortened_url_sync(url)
+  fields = {
+      'broadcaster_name': broadcaster_name,
+      'title': title,
+      'url': url,
+      'view_count': view_count,
+      'creator_name': creator_name,
+      'thumbnail_url': thumbnail_url,
+      'video_url': video_url,
+  }
+  ctx = {k: html.escape(str(v), quote=True) for k, v in fields.items()}
+  return _CLIP_HTML.format_map(ctx).encode('utf-8')
 
-@app.get("/", response_class=RedirectResponse)
-def root():
+def render_clip_page(clip_info: dict) -> bytes:
   """
-  Redirect the root URL to the specified GitHub repository.
+  Renders the embed HTML for a cached clip_info entry.
   """
-  logger.info("🏠 Root endpoint accessed; redirecting to GitHub repository.")
-  return RedirectResponse(url=GITHUB_REDIRECT_URL, status_code=301)
+  return render_clip_html(
+      clip_info['broadcaster_name'],
+      clip_info['title'],
+      clip_info['url'],
+      clip_info['view_count'],
+      clip_info['creator_name'],
+      clip_info['thumbnail_url'],
+      clip_info['shortened_url'],
+  )
 
 @app.get("/clip/{clip_id}")
-async def handle_clip(clip_id: str):
+async def handle_clip(clip_id: str, request: Request):
   """
   Handle Twitch clip requests by processing the clip ID.
   """
-  logger.info(f"🎥 Handling clip request for clip_id: {clip_id}")
+  logger.info("🎥 Handling clip request for clip_id: %s", clip_id)
+  if not _SLUG_RE.match(clip_id):
+      logger.warning("🚫 Invalid clip_id: %s", clip_id)
+      return PlainTextResponse(content="Error: invalid clip ID", status_code=400)
+
   try:
+      # The ETag needs clip_info, so a 304 only saves upstream calls when
+      # this worker already has the clip cached
       clip_info = await get_clip_info(clip_id)
-      shortened_url = await shorten_url(clip_info['video_url'])
-      logger.info(f"🔗 Clip info retrieved and URL shortened for clip_id: {clip_id}")
-
-      html_content = f"""
-      <html>
-      <head>
-          <meta charset="utf-8">
-          <meta name="theme-color" content="#6441a5">
-          <meta property="og:title" content="{clip_info['broadcaster_name']} - {clip_info['title']}">
-          <meta property="og:type" content="video">
-          <meta property="og:site_name" content="👁️ Views: {clip_info['view_count']} | {clip_info['creator_name']}">
-          <meta property="og:url" content="{clip_info['url']}">
-          <meta property="og:video" content="{shortened_url}">
-          <meta property="og:video:secure_url" content="{shortened_url}">
-          <meta property="og:video:type" content="video/mp4">
-          <meta property="og:image" content="{clip_info['thumbnail_url']}">
-          <script>
-              window.onload = function() {{
-                  window.location.href = "{clip_info['url']}";
-              }};
-          </script>
-      </head>
-      <body>
-          <p>Redirecting you to the Twitch clip...</p>
-          <p>If you are not redirected automatically, <a href="{clip_info['url']}">click here</a>.</p>
-      </body>
-      </html>
-      """
-      logger.info(f"🔀 Responding with HTML redirect for clip_id: {clip_id}")
-      return HTMLResponse(content=html_content, status_code=200)
+      etag = clip_etag(clip_id, clip_info)
+      cache_headers = {'Cache-Control': CLIP_CACHE_CONTROL, 'ETag': etag}
+      if etag_matches(request.headers.get('if-none-match', ''), etag):
+          logger.info("♻️ Clip not modified for clip_id: %s", clip_id)
+          return Response(status_code=304, headers=cache_headers)
+
+      html_content = render_clip_page(clip_info)
+      logger.info("🔀 Responding with HTML redirect for clip_id: %s", clip_id)
+      return HTMLResponse(content=html_content, status_code=200, headers=cache_headers)
+
+  except ClipNotFoundError as e:
+      return PlainTextResponse(content=f"Error: {str(e)}", status_code=404)
+
+  except httpx.TimeoutException as e:
+      logger.error("⏱️ Upstream timeout handling clip_id %s: %s", clip_id, e)
+      return PlainTextResponse(content="Error: upstream timed out", status_code=503)
 
   except Exception as e:
-      logger.error(f"❌ Error handling clip_id {clip_id}: {str(e)}")
+      logger.error("❌ Error handling clip_id %s: %s", clip_id, e)
       return PlainTextResponse(content=f"Error: {str(e)}", status_code=500)
 
-@app.middleware("http")
-async def catch_not_found(request: Request, call_next):
+@app.head("/clip/{clip_id}")
+async def handle_clip_head(clip_id: str, request: Request):
+  """
+  Answer link-preview HEAD probes without fetching the clip from Twitch.
+  """
+  logger.info("🎥 Handling clip HEAD request for clip_id: %s", clip_id)
+  if not _SLUG_RE.match(clip_id):
+      return Response(status_code=400)
+  if clip_id in _missing_clip_cache:
+      return Response(status_code=404)
+
+  clip_info = _clip_cache.get(clip_id)
+  if clip_info is None:
+      # Unverified clip: the length is unknown, and caches must not store this
+      response = Response(status_code=200, media_type='text/html', headers={'Cache-Control': 'no-store'})
+      del response.headers['content-length']
+      return response
+
+  etag = clip_etag(clip_id, clip_info)
+  headers = {'Cache-Control': CLIP_CACHE_CONTROL, 'ETag': etag}
+  if etag_matches(request.headers.get('if-none-match', ''), etag):
+      return Response(status_code=304, headers=headers)
+  # Same body and headers as GET; the server drops the body for HEAD
+  return HTMLResponse(content=render_clip_page(clip_info), status_code=200, headers=headers)
+
+@app.exception_handler(404)
+async def handle_not_found(request: Request, exc: Exception):
   """
-  Middleware to handle 404 Not Found for undefined routes.
+  Handle 404 Not Found for undefined routes.
   """
-  response = await call_next(request)
-  if response.status_code == 404:
-      logger.warning(f"🚫 404 Not Found: {request.url}")
-      return PlainTextResponse(content="Not Found", status_code=404)
-  return response
+  logger.warning("🚫 404 Not Found: %s", request.url)
+  return PlainTextResponse(content="Not Found", status_code=404)
 
 # To run the application, use the following command:
-# uvicorn fxtwitch:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+# uvicorn fxtwitch_cache:app --host 0.0.0.0 --port 8000 --workers $(nproc)
+# uvicorn picks uvloop and httptools automatically where uvicorn[standard] installs them.
\ No newline at end of file